@@ -122,8 +122,9 @@ def reset_database():
             dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD, host=DB_HOST
         )
         create_extension(conn)
-        if os.path.exists(os.path.join(PROGRESS_DIR, "processing_progress.json")):
-            os.remove(os.path.join(PROGRESS_DIR, "processing_progress.json"))
+        for progress_file in ["processing_progress.json", "processing_progress.log"]:
+            if os.path.exists(os.path.join(PROGRESS_DIR, progress_file)):
+                os.remove(os.path.join(PROGRESS_DIR, progress_file))
     except psycopg2.Error as e:
         logging.error(f"Error resetting database: {str(e)}")
         raise
@@ -293,6 +294,18 @@ def create_indices():
                 "idx_holdings_cusip_filing_id",
                 "CREATE INDEX IF NOT EXISTS idx_holdings_cusip_filing_id ON holdings (cusip, filing_id);",
             ),
+            (
+                "idx_holdings_short_cusip",
+                "CREATE INDEX IF NOT EXISTS idx_holdings_short_cusip ON holdings (cusip) WHERE LENGTH(cusip) < 9;",
+            ),
+            (
+                "idx_holdings_titleofclass_cusip_length",
+                "CREATE INDEX IF NOT EXISTS idx_holdings_titleofclass_cusip_length ON holdings (titleofclass) WHERE LENGTH(titleofclass) = 9;",
+            ),
+            (
+                "idx_holdings_nameofissuer_cusip_length",
+                "CREATE INDEX IF NOT EXISTS idx_holdings_nameofissuer_cusip_length ON holdings (nameofissuer) WHERE LENGTH(nameofissuer) = 9;",
+            ),
         ]
 
         for index_name, query in index_queries:
@@ -336,6 +349,9 @@ def drop_indices():
                 DROP INDEX IF EXISTS idx_filings_report_year_quarter;
                 DROP INDEX IF EXISTS idx_holdings_filing_id;
                 DROP INDEX IF EXISTS idx_holdings_cusip_filing_id;
+                DROP INDEX IF EXISTS idx_holdings_short_cusip;
+                DROP INDEX IF EXISTS idx_holdings_titleofclass_cusip_length;
+                DROP INDEX IF EXISTS idx_holdings_nameofissuer_cusip_length;
             """)
             conn.commit()
             logging.info("All indices dropped.")
@@ -1,16 +1,22 @@
-import json
+import atexit
 import logging
+import mmap
 import multiprocessing
+import multiprocessing.util
 import os
 import re
 import string
-import xml.etree.ElementTree as ET
+import threading
+import time
 from datetime import datetime
-from queue import Empty
+from io import BytesIO, StringIO
 
+import numpy as np
+import orjson
 import polars as pl
 import psycopg2
 import psycopg2.extras
+from lxml import etree
 from rich.progress import (
     BarColumn,
     MofNCompleteColumn,
@@ -30,6 +36,59 @@ from config import (
     STRUCTURED_DATA_DIR,
 )
 
+# Number of individual filings inserted per connection and transaction
+INDIVIDUAL_FILINGS_BATCH_SIZE = 100
+
+# Number of filings sent per INSERT statement when loading structured data
+FILINGS_PAGE_SIZE = 5000
+
+# Columns of the filings table loaded from structured data, in INSERT order
+FILINGS_COLUMNS = [
+    "accession_number",
+    "cik",
+    "filingmanager_name",
+    "submissiontype",
+    "filing_date",
+    "periodofreport",
+    "reportcalendarorquarter",
+    "isamendment",
+    "amendmentno",
+    "amendmenttype",
+    "confdeniedexpired",
+    "datedeniedexpired",
+    "datereported",
+    "reasonfornonconfidentiality",
+    "filingmanager_street1",
+    "filingmanager_street2",
+    "filingmanager_city",
+    "filingmanager_stateorcountry",
+    "filingmanager_zipcode",
+    "otherincludedmanagerscount",
+    "tableentrytotal",
+    "tablevaluetotal",
+    "isconfidentialomitted",
+    "reporttype",
+    "form13ffilenumber",
+    "crdnumber",
+    "secfilenumber",
+    "provideinfoforinstruction5",
+    "additionalinformation",
+    "other_managers",
+]
+
+# Number of accession numbers above which filing IDs are looked up through a
+# temporary table instead of an array parameter
+ACCESSION_LOOKUP_TABLE_THRESHOLD = 10_000
+
+# Number of progress events logged between rewrites of the progress JSON file
+PROGRESS_SAVE_INTERVAL = 1000
+
+# Seconds between saves of the progress JSON file while processing
+PROGRESS_SAVE_SECONDS = 5
+
+# Number of database connections left free for other clients while processing
+DB_CONNECTION_HEADROOM = 5
+
 
 class ProgressTracker:
     """Tracks processing progress for both structured data and individual filings."""
@@ -40,11 +99,18 @@ class ProgressTracker:
         """
         Initialize the ProgressTracker.
 
+        Progress events are appended to a log file next to the JSON file and
+        folded into the JSON file every PROGRESS_SAVE_INTERVAL events.
+
         Args:
             filename (str): Path to the JSON file for storing progress.
         """
         self.filename = filename
+        self.log_filename = os.path.splitext(filename)[0] + ".log"
+        self.log_file = None
+        self.unsaved_events = 0
         self.data = self._load_progress()
+        self._replay_log()
 
     def _load_progress(self) -> dict:
         """
@@ -54,22 +120,101 @@ class ProgressTracker:
             dict: The loaded progress data or a new progress structure.
         """
         if os.path.exists(self.filename):
-            with open(self.filename, "r") as f:
-                return json.load(f)
+            with open(self.filename, "rb") as f:
+                data = orjson.loads(f.read())
+            # Keep processed and failed items as sets for constant-time lookups
+            for progress in [
+                data["structured_data"],
+                *data["individual_filings"].values(),
+            ]:
+                progress["processed"] = set(progress["processed"])
+                progress["failed"] = set(progress["failed"])
+            return data
         return {
             "structured_data": {
-                "processed": [],
-                "failed": [],
+                "processed": set(),
+                "failed": set(),
             },
             "individual_filings": {},
             "last_updated": datetime.now().isoformat(),
         }
 
+    def _replay_log(self) -> None:
+        """
+        Apply progress events logged since the JSON file was last saved, then
+        save them to the JSON file and clear the log.
+        """
+        if not os.path.exists(self.log_filename):
+            return
+        replayed_events = 0
+        with open(self.log_filename, "r") as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) == 5:
+                    self._add(*fields)
+                    replayed_events += 1
+        if replayed_events:
+            self.save_progress()
+            os.truncate(self.log_filename, 0)
+
+    def _add(
+        self, status: str, category: str, year: int, quarter: int, item: str
+    ) -> None:
+        """
+        Add an item to the processed or failed items of its category.
+
+        Args:
+            status (str): Either 'processed' or 'failed'.
+            category (str): The category of the item ('structured_data' or 'individual_filings').
+            year (int): The year of the filing.
+            quarter (int): The quarter of the filing.
+            item (str): The identifier of the item.
+        """
+        if category == "structured_data":
+            self.data[category][status].add(item)
+        else:  # individual_filings
+            key = f"{year}_{quarter}"
+            if key not in self.data[category]:
+                self.data[category][key] = {"processed": set(), "failed": set()}
+            self.data[category][key][status].add(item)
+
+    def _log(
+        self, status: str, category: str, year: int, quarter: int, item: str
+    ) -> None:
+        """
+        Append a progress event to the log file, saving progress periodically.
+
+        Args:
+            status (str): Either 'processed' or 'failed'.
+            category (str): The category of the item ('structured_data' or 'individual_filings').
+            year (int): The year of the filing.
+            quarter (int): The quarter of the filing.
+            item (str): The identifier of the item.
+        """
+        if self.log_file is None:
+            self.log_file = open(self.log_filename, "a", buffering=1 << 16)
+            atexit.register(self.save_progress)
+        self.log_file.write(f"{status}\t{category}\t{year}\t{quarter}\t{item}\n")
+        self.unsaved_events += 1
+        if self.unsaved_events >= PROGRESS_SAVE_INTERVAL:
+            self.save_progress()
+
+    def flush_log(self) -> None:
+        """Write the progress events buffered since the last flush to the log file."""
+        if self.log_file is not None:
+            self.log_file.flush()
+
     def save_progress(self) -> None:
-        """Save current progress to file."""
+        """Save current progress to file and clear the progress log."""
         self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.filename, "w") as f:
-            json.dump(self.data, f, indent=2)
+        if self.log_file is not None:
+            self.log_file.flush()
+        with open(self.filename, "wb") as f:
+            # Sets of processed and failed items are written as sorted lists
+            f.write(orjson.dumps(self.data, default=sorted, option=orjson.OPT_INDENT_2))
+        if self.log_file is not None:
+            self.log_file.truncate(0)
+        self.unsaved_events = 0
 
     def mark_processed(self, category: str, year: int, quarter: int, item: str) -> None:
         """
@@ -81,16 +226,8 @@ class ProgressTracker:
             quarter (int): The quarter of the filing.
             item (str): The identifier of the item.
         """
-        if category == "structured_data":
-            if item not in self.data[category]["processed"]:
-                self.data[category]["processed"].append(item)
-        else:  # individual_filings
-            key = f"{year}_{quarter}"
-            if key not in self.data[category]:
-                self.data[category][key] = {"processed": [], "failed": []}
-            if item not in self.data[category][key]["processed"]:
-                self.data[category][key]["processed"].append(item)
-        self.save_progress()
+        self._add("processed", category, year, quarter, item)
+        self._log("processed", category, year, quarter, item)
 
     def mark_failed(self, category: str, year: int, quarter: int, item: str) -> None:
         """
@@ -102,16 +239,8 @@ class ProgressTracker:
             quarter (int): The quarter of the filing.
             item (str): The identifier of the item.
         """
-        if category == "structured_data":
-            if item not in self.data[category]["failed"]:
-                self.data[category]["failed"].append(item)
-        else:  # individual_filings
-            key = f"{year}_{quarter}"
-            if key not in self.data[category]:
-                self.data[category][key] = {"processed": [], "failed": []}
-            if item not in self.data[category][key]["failed"]:
-                self.data[category][key]["failed"].append(item)
-        self.save_progress()
+        self._add("failed", category, year, quarter, item)
+        self._log("failed", category, year, quarter, item)
 
     def is_processed(self, category: str, year: int, quarter: int, item: str) -> bool:
         """
@@ -158,6 +287,86 @@ class ProgressTracker:
 
 progress_tracker = ProgressTracker()
 
+# Patterns for the SGML header of an individual filing
+ACCESSION_NUMBER_RE = re.compile(rb"ACCESSION NUMBER:\s+(\S+)")
+ACCEPTANCE_DATETIME_RE = re.compile(rb"<ACCEPTANCE-DATETIME>(\d+)")
+
+# Clark notation prefix of the elements of the primary document
+FILER_NS = "{http://www.sec.gov/edgar/thirteenffiler}"
+
+INFO_TABLE_NS = {"ns1": "http://www.sec.gov/edgar/document/thirteenf/informationtable"}
+INFO_TABLE_TAG = f"{{{INFO_TABLE_NS['ns1']}}}infoTable"
+
+# Precompiled XPath expressions for the fields of an infoTable entry
+HOLDING_XPATHS = {
+    field: etree.XPath(f"{path}/text()", namespaces=INFO_TABLE_NS)
+    for field, path in {
+        "nameofissuer": "ns1:nameOfIssuer",
+        "titleofclass": "ns1:titleOfClass",
+        "cusip": "ns1:cusip",
+        "value": "ns1:value",
+        "sshprnamt": "ns1:shrsOrPrnAmt/ns1:sshPrnamt",
+        "sshprnamttype": "ns1:shrsOrPrnAmt/ns1:sshPrnamtType",
+        "putcall": "ns1:putCall",
+        "investmentdiscretion": "ns1:investmentDiscretion",
+        "othermanager": "ns1:otherManager",
+        "voting_auth_sole": "ns1:votingAuthority/ns1:Sole",
+        "voting_auth_shared": "ns1:votingAuthority/ns1:Shared",
+        "voting_auth_none": "ns1:votingAuthority/ns1:None",
+    }.items()
+}
+
+
+def holding_text(entry, field):
+    """
+    Get the stripped text of a holding field from an infoTable entry.
+
+    Args:
+        entry (etree._Element): The infoTable element.
+        field (str): The holding field name, a key of HOLDING_XPATHS.
+
+    Returns:
+        str: The stripped text, or None if the field is missing or empty.
+    """
+    found = HOLDING_XPATHS[field](entry)
+    return found[0].strip() if found else None
+
+
+def read_filing(file_path):
+    """
+    Read the XML sections and header fields of an individual filing.
+
+    The file is memory-mapped and the XML sections are sliced out by offset,
+    so the whole filing is never decoded into a string.
+
+    Args:
+        file_path (str): Path to the filing text file.
+
+    Returns:
+        tuple: The first two XML sections (list of bytes), the accession number
+            and the acceptance datetime (str, or None if missing).
+    """
+    xml_sections = []
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return xml_sections, None, None
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            start = content.find(b"<XML>")
+            while start != -1 and len(xml_sections) < 2:
+                end = content.find(b"</XML>", start)
+                if end == -1:
+                    break
+                xml_sections.append(content[start + len(b"<XML>") : end])
+                start = content.find(b"<XML>", end)
+
+            accession_match = ACCESSION_NUMBER_RE.search(content)
+            acceptance_match = ACCEPTANCE_DATETIME_RE.search(content)
+            return (
+                xml_sections,
+                accession_match.group(1).decode() if accession_match else None,
+                acceptance_match.group(1).decode() if acceptance_match else None,
+            )
+
 
 def parse_xml_filing(file_path):
     """
@@ -170,8 +379,10 @@ def parse_xml_filing(file_path):
         tuple: A tuple containing filing data (dict) and holdings data (list of dicts).
     """
 
-    def safe_find(element, path, namespaces):
-        found = element.find(path, namespaces)
+    def safe_find(element, tag):
+        if element is None:
+            return None
+        found = element.find(FILER_NS + tag)
         return found.text.strip() if found is not None and found.text else None
 
     def safe_parse_date(date_str):
@@ -182,176 +393,290 @@ def parse_xml_filing(file_path):
                 return None
         return None
 
-    with open(file_path, "r", encoding="utf-8") as file:
-        content = file.read()
-
-    xml_sections = re.findall(r"<XML>(.*?)</XML>", content, re.DOTALL)
+    xml_sections, accession_number, acceptance_datetime = read_filing(file_path)
     if len(xml_sections) < 2:
         logging.error(f"Could not find both XML sections in {file_path}")
         return None, []
 
-    primary_doc = ET.fromstring(xml_sections[0].strip())
-    info_table = ET.fromstring(xml_sections[1].strip())
+    primary_doc = etree.fromstring(xml_sections[0].strip())
 
-    ns = {
-        "ns": "http://www.sec.gov/edgar/thirteenffiler",
-        "com": "http://www.sec.gov/edgar/common",
-    }
+    # Index the first element of each tag in a single pass over the document
+    first_elements = {}
+    for element in primary_doc.iter(etree.Element):
+        first_elements.setdefault(element.tag, element)
 
-    other_managers = [
-        {
-            "sequenceNumber": safe_find(om, "ns:sequenceNumber", ns),
-            "cik": safe_find(om, "ns:otherManager/ns:cik", ns),
-            "form13FFileNumber": safe_find(
-                om, "ns:otherManager/ns:form13FFileNumber", ns
-            ),
-            "crdNumber": safe_find(om, "ns:otherManager/ns:crdNumber", ns),
-            "secFileNumber": safe_find(om, "ns:otherManager/ns:secFileNumber", ns),
-            "name": safe_find(om, "ns:otherManager/ns:name", ns),
-        }
-        for om in primary_doc.findall(".//ns:otherManagers2Info/ns:otherManager2", ns)
-    ]
+    def primary_text(tag):
+        found = first_elements.get(FILER_NS + tag)
+        return found.text.strip() if found is not None and found.text else None
+
+    other_managers = []
+    for om in primary_doc.iterfind(
+        f".//{FILER_NS}otherManagers2Info/{FILER_NS}otherManager2"
+    ):
+        # Look up the nested otherManager element once for all of its fields
+        other_manager = om.find(FILER_NS + "otherManager")
+        other_managers.append(
+            {
+                "sequenceNumber": safe_find(om, "sequenceNumber"),
+                "cik": safe_find(other_manager, "cik"),
+                "form13FFileNumber": safe_find(other_manager, "form13FFileNumber"),
+                "crdNumber": safe_find(other_manager, "crdNumber"),
+                "secFileNumber": safe_find(other_manager, "secFileNumber"),
+                "name": safe_find(other_manager, "name"),
+            }
+        )
 
     filing_data = {
-        "accession_number": re.search(r"ACCESSION NUMBER:\s+(\S+)", content)
-        .group(1)
-        .replace("-", ""),
-        "cik": safe_find(primary_doc, ".//ns:cik", ns).zfill(10),
-        "filingmanager_name": safe_find(primary_doc, ".//ns:name", ns),
-        "submissiontype": safe_find(primary_doc, ".//ns:submissionType", ns),
-        "filing_date": datetime.strptime(
-            re.search(r"<ACCEPTANCE-DATETIME>(\d+)", content).group(1), "%Y%m%d%H%M%S"
-        ).date(),
-        "periodofreport": safe_parse_date(
-            safe_find(primary_doc, ".//ns:periodOfReport", ns)
-        ),
+        "accession_number": accession_number.replace("-", ""),
+        "cik": primary_text("cik").zfill(10),
+        "filingmanager_name": primary_text("name"),
+        "submissiontype": primary_text("submissionType"),
+        "filing_date": datetime.strptime(acceptance_datetime, "%Y%m%d%H%M%S").date(),
+        "periodofreport": safe_parse_date(primary_text("periodOfReport")),
         "reportcalendarorquarter": safe_parse_date(
-            safe_find(primary_doc, ".//ns:reportCalendarOrQuarter", ns)
+            primary_text("reportCalendarOrQuarter")
         ),
-        "isamendment": safe_find(primary_doc, ".//ns:isAmendment", ns) == "true",
-        "amendmentno": int(safe_find(primary_doc, ".//ns:amendmentNumber", ns) or 0),
-        "amendmenttype": safe_find(primary_doc, ".//ns:amendmentType", ns),
-        "confdeniedexpired": safe_find(primary_doc, ".//ns:confDeniedExpired", ns)
-        == "true",
-        "datedeniedexpired": safe_parse_date(
-            safe_find(primary_doc, ".//ns:dateDeniedExpired", ns)
-        ),
-        "datereported": safe_parse_date(
-            safe_find(primary_doc, ".//ns:dateReported", ns)
-        ),
-        "reasonfornonconfidentiality": safe_find(
-            primary_doc, ".//ns:reasonForNonConfidentiality", ns
-        ),
-        "filingmanager_street1": safe_find(primary_doc, ".//ns:street1", ns),
-        "filingmanager_street2": safe_find(primary_doc, ".//ns:street2", ns),
-        "filingmanager_city": safe_find(primary_doc, ".//ns:city", ns),
-        "filingmanager_stateorcountry": safe_find(
-            primary_doc, ".//ns:stateOrCountry", ns
-        ),
-        "filingmanager_zipcode": safe_find(primary_doc, ".//ns:zipCode", ns),
+        "isamendment": primary_text("isAmendment") == "true",
+        "amendmentno": int(primary_text("amendmentNumber") or 0),
+        "amendmenttype": primary_text("amendmentType"),
+        "confdeniedexpired": primary_text("confDeniedExpired") == "true",
+        "datedeniedexpired": safe_parse_date(primary_text("dateDeniedExpired")),
+        "datereported": safe_parse_date(primary_text("dateReported")),
+        "reasonfornonconfidentiality": primary_text("reasonForNonConfidentiality"),
+        "filingmanager_street1": primary_text("street1"),
+        "filingmanager_street2": primary_text("street2"),
+        "filingmanager_city": primary_text("city"),
+        "filingmanager_stateorcountry": primary_text("stateOrCountry"),
+        "filingmanager_zipcode": primary_text("zipCode"),
         "otherincludedmanagerscount": int(
-            safe_find(primary_doc, ".//ns:otherIncludedManagersCount", ns) or 0
-        ),
-        "tableentrytotal": int(
-            safe_find(primary_doc, ".//ns:tableEntryTotal", ns) or 0
+            primary_text("otherIncludedManagersCount") or 0
         ),
-        "tablevaluetotal": float(
-            safe_find(primary_doc, ".//ns:tableValueTotal", ns) or 0
-        ),
-        "isconfidentialomitted": safe_find(
-            primary_doc, ".//ns:isConfidentialOmitted", ns
-        )
-        == "true",
-        "reporttype": safe_find(primary_doc, ".//ns:reportType", ns),
-        "form13ffilenumber": safe_find(primary_doc, ".//ns:form13FFileNumber", ns),
-        "crdnumber": safe_find(primary_doc, ".//ns:crdNumber", ns),
-        "secfilenumber": safe_find(primary_doc, ".//ns:secFileNumber", ns),
-        "provideinfoforinstruction5": safe_find(
-            primary_doc, ".//ns:provideInfoForInstruction5", ns
-        )
+        "tableentrytotal": int(primary_text("tableEntryTotal") or 0),
+        "tablevaluetotal": float(primary_text("tableValueTotal") or 0),
+        "isconfidentialomitted": primary_text("isConfidentialOmitted") == "true",
+        "reporttype": primary_text("reportType"),
+        "form13ffilenumber": primary_text("form13FFileNumber"),
+        "crdnumber": primary_text("crdNumber"),
+        "secfilenumber": primary_text("secFileNumber"),
+        "provideinfoforinstruction5": primary_text("provideInfoForInstruction5")
         == "true",
-        "additionalinformation": safe_find(
-            primary_doc, ".//ns:additionalInformation", ns
-        ),
-        "other_managers": json.dumps(other_managers),
+        "additionalinformation": primary_text("additionalInformation"),
+        "other_managers": orjson.dumps(other_managers).decode(),
     }
 
-    ns = {"ns1": "http://www.sec.gov/edgar/document/thirteenf/informationtable"}
-    holdings = [
-        {
-            "nameofissuer": safe_find(entry, "ns1:nameOfIssuer", ns).strip().upper()
-            if safe_find(entry, "ns1:nameOfIssuer", ns)
-            else None,
-            "titleofclass": safe_find(entry, "ns1:titleOfClass", ns).strip().upper()
-            if safe_find(entry, "ns1:titleOfClass", ns)
-            else None,
-            "cusip": safe_find(entry, "ns1:cusip", ns).strip().upper()
-            if safe_find(entry, "ns1:cusip", ns)
-            else None,
-            "value": float(safe_find(entry, "ns1:value", ns) or 0),
-            "sshprnamt": float(
-                safe_find(entry, "ns1:shrsOrPrnAmt/ns1:sshPrnamt", ns) or 0
-            ),
-            "sshprnamttype": safe_find(
-                entry, "ns1:shrsOrPrnAmt/ns1:sshPrnamtType", ns
-            ).strip()
-            if safe_find(entry, "ns1:shrsOrPrnAmt/ns1:sshPrnamtType", ns)
-            else None,
-            "putcall": safe_find(entry, "ns1:putCall", ns),
-            "investmentdiscretion": safe_find(
-                entry, "ns1:investmentDiscretion", ns
-            ).strip()
-            if safe_find(entry, "ns1:investmentDiscretion", ns)
-            else None,
-            "othermanager": safe_find(entry, "ns1:otherManager", ns),
-            "voting_auth_sole": int(
-                safe_find(entry, "ns1:votingAuthority/ns1:Sole", ns) or 0
-            ),
-            "voting_auth_shared": int(
-                safe_find(entry, "ns1:votingAuthority/ns1:Shared", ns) or 0
-            ),
-            "voting_auth_none": int(
-                safe_find(entry, "ns1:votingAuthority/ns1:None", ns) or 0
-            ),
-        }
-        for entry in info_table.findall(".//ns1:infoTable", ns)
-    ]
+    holdings = []
+    for _, entry in etree.iterparse(
+        BytesIO(xml_sections[1].strip()), tag=INFO_TABLE_TAG
+    ):
+        nameofissuer = holding_text(entry, "nameofissuer")
+        titleofclass = holding_text(entry, "titleofclass")
+        cusip = holding_text(entry, "cusip")
+        sshprnamttype = holding_text(entry, "sshprnamttype")
+        investmentdiscretion = holding_text(entry, "investmentdiscretion")
+        holdings.append(
+            {
+                "nameofissuer": nameofissuer.upper() if nameofissuer else None,
+                "titleofclass": titleofclass.upper() if titleofclass else None,
+                "cusip": cusip.upper() if cusip else None,
+                "value": float(holding_text(entry, "value") or 0),
+                "sshprnamt": float(holding_text(entry, "sshprnamt") or 0),
+                "sshprnamttype": sshprnamttype if sshprnamttype else None,
+                "putcall": holding_text(entry, "putcall"),
+                "investmentdiscretion": investmentdiscretion
+                if investmentdiscretion
+                else None,
+                "othermanager": holding_text(entry, "othermanager"),
+                "voting_auth_sole": int(holding_text(entry, "voting_auth_sole") or 0),
+                "voting_auth_shared": int(
+                    holding_text(entry, "voting_auth_shared") or 0
+                ),
+                "voting_auth_none": int(holding_text(entry, "voting_auth_none") or 0),
+            }
+        )
+        # Free the parsed entry so memory stays flat on large information tables
+        entry.clear()
 
     return filing_data, holdings
 
 
-def process_structured_data(
-    folder_path: str, progress_queue: multiprocessing.Queue
-) -> None:
+def copy_value(value) -> str:
+    """
+    Format a value for a text-format COPY row.
+
+    Args:
+        value: The value to format.
+
+    Returns:
+        str: The escaped value, or the NULL marker if the value is None.
+    """
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_holdings(cur, holdings_data) -> None:
+    """
+    Bulk load holdings rows with COPY FROM STDIN.
+
+    Args:
+        cur (psycopg2.extensions.cursor): The database cursor.
+        holdings_data (iterable[tuple]): Rows in the column order of the COPY statement.
+    """
+    buffer = StringIO()
+    for row in holdings_data:
+        buffer.write("\t".join(copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    cur.copy_expert(
+        """
+        COPY holdings (
+            filing_id, nameofissuer, titleofclass, cusip, value, sshprnamt,
+            sshprnamttype, putcall, investmentdiscretion, othermanager,
+            voting_auth_sole, voting_auth_shared, voting_auth_none
+        )
+        FROM STDIN
+        """,
+        buffer,
+    )
+
+
+def lookup_filing_ids(cur, accession_numbers: list[str]) -> dict:
+    """
+    Look up the IDs of the filings with the given accession numbers.
+
+    Large lookups are copied into a temporary table and joined against filings,
+    which is cheaper than sending and planning a huge array parameter.
+
+    Args:
+        cur (psycopg2.extensions.cursor): The cursor to run the lookup on.
+        accession_numbers (list[str]): The accession numbers to look up.
+
+    Returns:
+        dict: A mapping of accession number to filing ID for the filings found.
+    """
+    if len(accession_numbers) > ACCESSION_LOOKUP_TABLE_THRESHOLD:
+        cur.execute(
+            """
+            CREATE TEMP TABLE lookup_accession_numbers (
+                accession_number VARCHAR(25) PRIMARY KEY
+            ) ON COMMIT DROP
+            """
+        )
+        cur.copy_expert(
+            "COPY lookup_accession_numbers FROM STDIN",
+            StringIO("".join(f"{copy_value(a)}\n" for a in accession_numbers)),
+        )
+        cur.execute(
+            """
+            SELECT f.accession_number, f.id
+            FROM filings f
+            JOIN lookup_accession_numbers USING (accession_number)
+            """
+        )
+    else:
+        cur.execute(
+            """
+            SELECT accession_number, id
+            FROM filings
+            WHERE accession_number = ANY(%s)
+            """,
+            (accession_numbers,),
+        )
+    return dict(cur.fetchall())
+
+
+# Database connection of the current pool worker, see get_worker_connection
+worker_conn = None
+
+
+def get_worker_connection():
+    """
+    Get the database connection of the current worker process.
+
+    The connection is opened by the first task of the worker and is reused by
+    every task the worker runs until the worker exits.
+
+    Returns:
+        psycopg2.extensions.connection: The connection of the worker.
+    """
+    global worker_conn
+    if worker_conn is None or worker_conn.closed:
+        worker_conn = psycopg2.connect(
+            dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD
+        )
+        # Pool workers leave through os._exit, which skips atexit handlers
+        multiprocessing.util.Finalize(None, worker_conn.close, exitpriority=10)
+    return worker_conn
+
+
+def get_connection_budget() -> int:
+    """
+    Get the number of database connections the worker processes may open.
+
+    Returns:
+        int: The free connections of the server, less DB_CONNECTION_HEADROOM.
+    """
+    conn = None
+    try:
+        conn = psycopg2.connect(dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT current_setting('max_connections')::int
+                    - current_setting('superuser_reserved_connections')::int
+                    - (SELECT COUNT(*) FROM pg_stat_activity WHERE backend_type = 'client backend')
+                """
+            )
+            # This connection is closed before the workers open theirs
+            free_connections = cur.fetchone()[0] + 1
+    except Exception as e:
+        logging.error(f"Error getting the database connection budget: {str(e)}")
+        return multiprocessing.cpu_count()
+    finally:
+        if conn:
+            conn.close()
+
+    return max(1, free_connections - DB_CONNECTION_HEADROOM)
+
+
+def process_structured_data(folder_path: str) -> list[tuple]:
     """
     Process a single structured data folder, parsing TSV files and inserting data into the database.
 
     Args:
         folder_path (str): Path to the folder containing TSV files.
-        progress_queue (multiprocessing.Queue): Queue to report progress back to the main process.
+
+    Returns:
+        list[tuple]: The progress message for the folder, or no messages if it failed.
     """
     logging.info(f"Processing folder: {folder_path}")
     conn = None
     cur = None
     try:
-        # Load TSV files into Polars DataFrames
-        submission_df = pl.read_csv(
+        # Scan TSV files lazily so the transformations below run as one query plan
+        submission_df = pl.scan_csv(
             os.path.join(folder_path, "SUBMISSION.tsv"),
             separator="\t",
         )
-        coverpage_df = pl.read_csv(
+        coverpage_df = pl.scan_csv(
             os.path.join(folder_path, "COVERPAGE.tsv"),
             separator="\t",
         )
-        summarypage_df = pl.read_csv(
+        summarypage_df = pl.scan_csv(
             os.path.join(folder_path, "SUMMARYPAGE.tsv"),
             separator="\t",
         )
-        othermanager2_df = pl.read_csv(
+        othermanager2_df = pl.scan_csv(
             os.path.join(folder_path, "OTHERMANAGER2.tsv"),
             separator="\t",
         )
-        infotable_df = pl.read_csv(
+        infotable_df = pl.scan_csv(
             os.path.join(folder_path, "INFOTABLE.tsv"),
             separator="\t",
             schema_overrides={"OTHERMANAGER": pl.Utf8},
@@ -369,13 +694,20 @@ def process_structured_data(
             "DATEDENIEDEXPIRED",
             "DATEREPORTED",
         ]
-        for col in date_columns:
-            filings_df = filings_df.with_columns(
-                pl.when(pl.col(col).is_not_null())
-                .then(pl.col(col).str.strptime(pl.Date, "%d-%b-%Y"))
-                .otherwise(None)
-                .alias(col)
-            )
+        filings_df = filings_df.with_columns(
+            [
+                pl.col(col).str.strptime(pl.Date, "%d-%b-%Y", strict=False).alias(col)
+                for col in date_columns
+            ]
+        )
+
+        # Group other managers per filing once and attach them with a join
+        othermanagers_df = othermanager2_df.group_by("ACCESSION_NUMBER").agg(
+            pl.struct(pl.all().exclude("ACCESSION_NUMBER")).alias("OTHER_MANAGERS")
+        )
+        filings_df = filings_df.join(
+            othermanagers_df, on="ACCESSION_NUMBER", how="left"
+        )
 
         # Apply transformations and create JSON column for OTHER_MANAGERS
         filings_df = filings_df.with_columns(
@@ -388,18 +720,13 @@ def process_structured_data(
             pl.col("ISCONFIDENTIALOMITTED").eq("Y").fill_null(False),
             pl.col("PROVIDEINFOFORINSTRUCTION5").eq("Y").fill_null(False),
             pl.col("AMENDMENTNO").cast(pl.Int32).fill_null(0),
-            pl.col("ACCESSION_NUMBER")
-            .map_elements(
-                lambda accession_number: json.dumps(
-                    [
-                        {k: v for k, v in row.items() if k != "ACCESSION_NUMBER"}
-                        for row in othermanager2_df.filter(
-                            pl.col("ACCESSION_NUMBER") == accession_number
-                        ).to_dicts()
-                    ]
-                ),
-                return_dtype=pl.Utf8,
+            pl.format(
+                "[{}]",
+                pl.col("OTHER_MANAGERS")
+                .list.eval(pl.element().struct.json_encode())
+                .list.join(","),
             )
+            .fill_null("[]")
             .alias("OTHER_MANAGERS"),
         )
 
@@ -407,6 +734,11 @@ def process_structured_data(
         filings_df = filings_df.with_columns(
             pl.col("ACCESSION_NUMBER").str.replace("-", "")
         )
+
+        # Project the filings to the columns of the INSERT, in its order
+        filings_df = filings_df.select(
+            [pl.col(col.upper()).alias(col) for col in FILINGS_COLUMNS]
+        )
         infotable_df = infotable_df.with_columns(
             [
                 pl.col("ACCESSION_NUMBER").str.replace("-", ""),
@@ -418,184 +750,286 @@ def process_structured_data(
             ]
         )
 
-        conn = psycopg2.connect(dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+        # Execute both query plans together
+        filings_df, infotable_df = pl.collect_all([filings_df, infotable_df])
+
+        conn = get_worker_connection()
         cur = conn.cursor()
 
         try:
-            # Get the column names from the DataFrame
-            columns = filings_df.columns
-
             # Create the INSERT query
             insert_query = f"""
-                INSERT INTO filings ({', '.join(col.lower() for col in columns)})
+                INSERT INTO filings ({', '.join(FILINGS_COLUMNS)})
                 VALUES %s
                 ON CONFLICT (accession_number) DO NOTHING
+                RETURNING accession_number, id
             """
 
             # Prepare the data for insertion
-            insert_data = [tuple(row.values()) for row in filings_df.to_dicts()]
-
-            # Execute the insertion
-            psycopg2.extras.execute_values(cur, insert_query, insert_data)
+            insert_data = filings_df.rows()
 
-            # Fetch the filing IDs for all accession numbers in infotable_df
-            accession_numbers = infotable_df["ACCESSION_NUMBER"].unique().to_list()
-            cur.execute(
-                """
-                SELECT accession_number, id 
-                FROM filings
-                WHERE accession_number = ANY(%s)
-                """,
-                (accession_numbers,),
+            # Execute the insertion and collect the IDs of the new filings
+            accession_to_id = dict(
+                psycopg2.extras.execute_values(
+                    cur,
+                    insert_query,
+                    insert_data,
+                    page_size=FILINGS_PAGE_SIZE,
+                    fetch=True,
+                )
             )
-            accession_to_id = dict(cur.fetchall())
 
-            # Insert holdings data
-            holdings_data = [
-                (
-                    accession_to_id.get(row.get("ACCESSION_NUMBER")),
-                    row.get("NAMEOFISSUER"),
-                    row.get("TITLEOFCLASS"),
-                    row.get("CUSIP"),
-                    row.get("VALUE"),
-                    row.get("SSHPRNAMT"),
-                    row.get("SSHPRNAMTTYPE"),
-                    row.get("PUTCALL"),
-                    row.get("INVESTMENTDISCRETION"),
-                    row.get("OTHERMANAGER"),
-                    row.get("VOTING_AUTH_SOLE"),
-                    row.get("VOTING_AUTH_SHARED"),
-                    row.get("VOTING_AUTH_NONE"),
-                )
-                for row in infotable_df.to_dicts()
-                if accession_to_id.get(row.get("ACCESSION_NUMBER")) is not None
+            # Fetch the filing IDs of holdings whose filings were not just inserted
+            accession_numbers = [
+                accession_number
+                for accession_number in infotable_df["ACCESSION_NUMBER"]
+                .unique()
+                .to_list()
+                if accession_number not in accession_to_id
             ]
+            if accession_numbers:
+                accession_to_id.update(lookup_filing_ids(cur, accession_numbers))
 
-            psycopg2.extras.execute_values(
-                cur,
-                """
-                INSERT INTO holdings (
-                    filing_id, nameofissuer, titleofclass, cusip, value, sshprnamt, 
-                    sshprnamttype, putcall, investmentdiscretion, othermanager,  
-                    voting_auth_sole, voting_auth_shared, voting_auth_none
-                ) 
-                VALUES %s
-                """,
-                holdings_data,
+            # Insert holdings data
+            holdings_data = (
+                (filing_id,) + row[1:]
+                for row in infotable_df.select(
+                    "ACCESSION_NUMBER",
+                    "NAMEOFISSUER",
+                    "TITLEOFCLASS",
+                    "CUSIP",
+                    "VALUE",
+                    "SSHPRNAMT",
+                    "SSHPRNAMTTYPE",
+                    "PUTCALL",
+                    "INVESTMENTDISCRETION",
+                    "OTHERMANAGER",
+                    "VOTING_AUTH_SOLE",
+                    "VOTING_AUTH_SHARED",
+                    "VOTING_AUTH_NONE",
+                ).iter_rows()
+                if (filing_id := accession_to_id.get(row[0])) is not None
             )
 
+            copy_holdings(cur, holdings_data)
+
             conn.commit()
             year, quarter = os.path.basename(folder_path).split("_")
             logging.info(f"Processed folder: {folder_path}")
-            progress_queue.put(
+            return [
                 (
+                    "processed",
                     "structured_data",
                     folder_path,
                     int(year),
                     int(quarter[1]),
                     f"{year}_Q{quarter[1]}",
                 )
-            )
+            ]
         except Exception as e:
             logging.error(f"Error processing folder {folder_path}: {str(e)}")
             conn.rollback()
         finally:
             cur.close()
-            conn.close()
 
     except Exception as e:
         logging.error(
             f"Error processing structured data folder {folder_path}: {str(e)}"
         )
 
+    return []
 
-def process_individual_filing(
-    file_path: str, progress_queue: multiprocessing.Queue
-) -> None:
+
+def insert_individual_filings(cur, parsed_filings: list[tuple]) -> None:
     """
-    Process a single XML file and insert its data into the database.
+    Insert parsed individual filings and their holdings.
+
+    Only the first file with a newly inserted accession number gets holdings.
 
     Args:
+        cur (psycopg2.extensions.cursor): The cursor to insert with.
+        parsed_filings (list[tuple]): (file_path, filing_data, holdings) of each file.
+    """
+    # Insert filing data
+    inserted_filings = psycopg2.extras.execute_values(
+        cur,
+        """
+        INSERT INTO filings (
+            accession_number, cik, filingmanager_name, submissiontype, filing_date, periodofreport,
+            reportcalendarorquarter, isamendment, amendmentno, amendmenttype, confdeniedexpired,
+            datedeniedexpired, datereported, reasonfornonconfidentiality, filingmanager_street1,
+            filingmanager_street2, filingmanager_city, filingmanager_stateorcountry, filingmanager_zipcode,
+            otherincludedmanagerscount, tableentrytotal, tablevaluetotal, isconfidentialomitted,
+            reporttype, form13ffilenumber, crdnumber, secfilenumber, provideinfoforinstruction5,
+            additionalinformation, other_managers
+        ) 
+        VALUES %s
+        ON CONFLICT (accession_number) DO NOTHING
+        RETURNING id, accession_number
+        """,
+        [filing_data for _, filing_data, _ in parsed_filings],
+        template="""(
+            %(accession_number)s, %(cik)s, %(filingmanager_name)s, %(submissiontype)s, %(filing_date)s, 
+            %(periodofreport)s, %(reportcalendarorquarter)s, %(isamendment)s, %(amendmentno)s, 
+            %(amendmenttype)s, %(confdeniedexpired)s, %(datedeniedexpired)s, %(datereported)s, 
+            %(reasonfornonconfidentiality)s, %(filingmanager_street1)s, %(filingmanager_street2)s, 
+            %(filingmanager_city)s, %(filingmanager_stateorcountry)s, %(filingmanager_zipcode)s, 
+            %(otherincludedmanagerscount)s, %(tableentrytotal)s, %(tablevaluetotal)s, 
+            %(isconfidentialomitted)s, %(reporttype)s, %(form13ffilenumber)s, %(crdnumber)s, 
+            %(secfilenumber)s, %(provideinfoforinstruction5)s, %(additionalinformation)s, %(other_managers)s
+        )""",
+        page_size=len(parsed_filings),
+        fetch=True,
+    )
+    accession_to_id = {
+        accession_number: filing_id for filing_id, accession_number in inserted_filings
+    }
+
+    holdings_data = []
+    for _, filing_data, holdings in parsed_filings:
+        filing_id = accession_to_id.pop(filing_data["accession_number"], None)
+        if filing_id is not None:
+            holdings_data.extend(
+                (filing_id,) + tuple(holding.values()) for holding in holdings
+            )
+
+    # Insert holdings data
+    copy_holdings(cur, holdings_data)
+
+
+def filing_progress_message(status: str, file_path: str) -> tuple:
+    """
+    Build the progress message of an individual filing.
+
+    Args:
+        status (str): 'processed' or 'failed'.
         file_path (str): Path to the XML file.
-        progress_queue (multiprocessing.Queue): Queue to report progress back to the main process.
+
+    Returns:
+        tuple: The progress message of the file.
     """
-    conn = None
+    year, quarter = os.path.basename(os.path.dirname(file_path)).split("_")
+    filename = os.path.basename(file_path)
+    return (status, "individual_filings", file_path, year, quarter, filename)
+
+
+def process_individual_filing_batch(file_paths: list[str]) -> list[tuple]:
+    """
+    Process a batch of XML files and insert their data into the database.
+
+    All files in the batch are inserted in a single transaction on the
+    connection of the worker. If that fails, the files are inserted again one
+    at a time so a single bad filing only fails itself.
+
+    Args:
+        file_paths (list[str]): Paths to the XML files.
+
+    Returns:
+        list[tuple]: A progress message for each processed or failed file.
+    """
+    progress_messages = []
     cur = None
-    # logging.info(f"Processing file: {file_path}")
     try:
-        filing_data, holdings = parse_xml_filing(file_path)
+        parsed_filings = []
+        for file_path in file_paths:
+            try:
+                filing_data, holdings = parse_xml_filing(file_path)
+            except Exception as e:
+                logging.error(f"Error processing XML file {file_path}: {str(e)}")
+                progress_messages.append(filing_progress_message("failed", file_path))
+                continue
 
-        if filing_data is None:
-            logging.error(f"Failed to parse XML file: {file_path}")
-            return
+            if filing_data is None:
+                logging.error(f"Failed to parse XML file: {file_path}")
+                progress_messages.append(filing_progress_message("failed", file_path))
+                continue
 
-        conn = psycopg2.connect(dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+            parsed_filings.append((file_path, filing_data, holdings))
+
+        if not parsed_filings:
+            return progress_messages
+
+        conn = get_worker_connection()
         cur = conn.cursor()
 
         try:
-            # Insert filing data
-            cur.execute(
-                """
-                INSERT INTO filings (
-                    accession_number, cik, filingmanager_name, submissiontype, filing_date, periodofreport,
-                    reportcalendarorquarter, isamendment, amendmentno, amendmenttype, confdeniedexpired,
-                    datedeniedexpired, datereported, reasonfornonconfidentiality, filingmanager_street1,
-                    filingmanager_street2, filingmanager_city, filingmanager_stateorcountry, filingmanager_zipcode,
-                    otherincludedmanagerscount, tableentrytotal, tablevaluetotal, isconfidentialomitted,
-                    reporttype, form13ffilenumber, crdnumber, secfilenumber, provideinfoforinstruction5,
-                    additionalinformation, other_managers
-                ) 
-                VALUES (
-                    %(accession_number)s, %(cik)s, %(filingmanager_name)s, %(submissiontype)s, %(filing_date)s, 
-                    %(periodofreport)s, %(reportcalendarorquarter)s, %(isamendment)s, %(amendmentno)s, 
-                    %(amendmenttype)s, %(confdeniedexpired)s, %(datedeniedexpired)s, %(datereported)s, 
-                    %(reasonfornonconfidentiality)s, %(filingmanager_street1)s, %(filingmanager_street2)s, 
-                    %(filingmanager_city)s, %(filingmanager_stateorcountry)s, %(filingmanager_zipcode)s, 
-                    %(otherincludedmanagerscount)s, %(tableentrytotal)s, %(tablevaluetotal)s, 
-                    %(isconfidentialomitted)s, %(reporttype)s, %(form13ffilenumber)s, %(crdnumber)s, 
-                    %(secfilenumber)s, %(provideinfoforinstruction5)s, %(additionalinformation)s, %(other_managers)s
-                )
-                ON CONFLICT (accession_number) DO NOTHING
-                RETURNING id
-            """,
-                filing_data,
+            insert_individual_filings(cur, parsed_filings)
+            conn.commit()
+            batches = []
+        except Exception as e:
+            logging.error(
+                f"Error processing XML batch starting at {file_paths[0]}, "
+                f"retrying its files one at a time: {str(e)}"
             )
+            conn.rollback()
+            batches = [[parsed_filing] for parsed_filing in parsed_filings]
+            parsed_filings = []
+
+        for batch in batches:
+            file_path = batch[0][0]
+            try:
+                insert_individual_filings(cur, batch)
+                conn.commit()
+                parsed_filings.extend(batch)
+            except Exception as e:
+                logging.error(f"Error processing XML file {file_path}: {str(e)}")
+                conn.rollback()
+                progress_messages.append(filing_progress_message("failed", file_path))
+
+        for file_path, _, _ in parsed_filings:
+            logging.info(f"Processed XML file: {file_path}")
+            progress_messages.append(filing_progress_message("processed", file_path))
+
+    except Exception as e:
+        logging.error(
+            f"Error processing XML batch starting at {file_paths[0]}: {str(e)}"
+        )
+    finally:
+        if cur:
+            cur.close()
 
-            filing_id = cur.fetchone()
+    return progress_messages
 
-            if filing_id:
-                filing_id = filing_id[0]
 
-                # Insert holdings data
-                psycopg2.extras.execute_values(
-                    cur,
-                    """
-                    INSERT INTO holdings (
-                        filing_id, nameofissuer, titleofclass, cusip, value, sshprnamt, 
-                        sshprnamttype, putcall, investmentdiscretion, othermanager,  
-                        voting_auth_sole, voting_auth_shared, voting_auth_none
-                    ) 
-                    VALUES %s
-                    """,
-                    [(filing_id,) + tuple(holding.values()) for holding in holdings],
-                )
+def record_progress(
+    results,
+    progress_tracker: ProgressTracker,
+    progress: Progress,
+    progress_tasks: dict,
+    lock: threading.Lock,
+) -> None:
+    """
+    Record the progress messages returned by pool tasks as they complete.
 
-            conn.commit()
-            year, quarter = os.path.basename(os.path.dirname(file_path)).split("_")
-            filename = os.path.basename(file_path)
-            logging.info(f"Processed XML file: {file_path}")
-            progress_queue.put(
-                ("individual_filings", file_path, year, quarter, filename)
-            )
-        except Exception as e:
-            logging.error(f"Error processing XML file {file_path}: {str(e)}")
-            conn.rollback()
-        finally:
-            cur.close()
-            conn.close()
+    The progress log is flushed after each task, and unsaved progress is also
+    written to disk every PROGRESS_SAVE_SECONDS seconds.
 
-    except Exception as e:
-        logging.error(f"Error processing XML file {file_path}: {str(e)}")
+    Args:
+        results (Iterator[list[tuple]]): Progress messages of each completed task.
+        progress_tracker (ProgressTracker): Tracker to record processed items in.
+        progress (Progress): Progress display to advance.
+        progress_tasks (dict): Progress task IDs keyed by category.
+        lock (threading.Lock): Lock shared by all threads recording progress.
+    """
+    last_saved = time.monotonic()
+    for progress_messages in results:
+        with lock:
+            for status, category, file_path, year, quarter, item in progress_messages:
+                if status == "processed":
+                    progress_tracker.mark_processed(category, year, quarter, item)
+                else:
+                    progress_tracker.mark_failed(category, year, quarter, item)
+                progress.update(progress_tasks[category], advance=1)
+
+            if (
+                progress_tracker.unsaved_events
+                and time.monotonic() - last_saved >= PROGRESS_SAVE_SECONDS
+            ):
+                progress_tracker.save_progress()
+                last_saved = time.monotonic()
+            else:
+                # Write the events of the task to disk before the next one
+                progress_tracker.flush_log()
 
 
 def process_13f_data(quarters: list[tuple[int, int]]) -> None:
@@ -620,13 +1054,14 @@ def process_13f_data(quarters: list[tuple[int, int]]) -> None:
     )
 
     with progress:
+        progress_tasks = {}
         if structured_data_quarters:
             structured_data_total = len(structured_data_quarters)
             structured_data_completed = sum(
                 progress_tracker.is_processed("structured_data", y, q, f"{y}_Q{q}")
                 for y, q in structured_data_quarters
             )
-            structured_data_task = progress.add_task(
+            progress_tasks["structured_data"] = progress.add_task(
                 "Structured Data",
                 total=structured_data_total,
                 completed=structured_data_completed,
@@ -650,7 +1085,7 @@ def process_13f_data(quarters: list[tuple[int, int]]) -> None:
                 progress_tracker.get_processed_count("individual_filings", y, q)
                 for y, q in individual_filing_quarters
             )
-            individual_filings_task = progress.add_task(
+            progress_tasks["individual_filings"] = progress.add_task(
                 "Individual Filings",
                 total=individual_filings_total,
                 completed=individual_filings_completed,
@@ -677,58 +1112,90 @@ def process_13f_data(quarters: list[tuple[int, int]]) -> None:
             )
         ]
 
-        # Process tasks using multiprocessing
-        with multiprocessing.Manager() as manager:
-            progress_queue = manager.Queue()
+        individual_filing_batches = [
+            remaining_individual_filings[i : i + INDIVIDUAL_FILINGS_BATCH_SIZE]
+            for i in range(
+                0, len(remaining_individual_filings), INDIVIDUAL_FILINGS_BATCH_SIZE
+            )
+        ]
 
-            total_workers = multiprocessing.cpu_count()
+        # Process tasks using multiprocessing
+        # Structured data is CPU-bound, while individual filings wait on the
+        # database as much as they parse XML, so they get twice the workers.
+        # Every worker opens one connection, so together they stay within
+        # the free connections of the server.
+        connection_budget = get_connection_budget()
+        structured_data_workers = min(
+            multiprocessing.cpu_count(),
+            len(remaining_structured_data),
+            connection_budget,
+        )
+        individual_filing_workers = max(
+            1,
+            min(
+                len(individual_filing_batches),
+                multiprocessing.cpu_count() * 2,
+                connection_budget - structured_data_workers,
+            ),
+        )
 
-            with multiprocessing.Pool(processes=total_workers) as pool:
-                # Start processes for structured data
-                structured_data_results = pool.starmap_async(
+        pools = []
+        progress_threads = []
+        lock = threading.Lock()
+        try:
+            # Start a pool for each category with work left, and record the
+            # progress it returns as its tasks complete
+            for process_task, tasks, workers in [
+                (
                     process_structured_data,
-                    [(folder, progress_queue) for folder in remaining_structured_data],
-                    chunksize=1,
+                    remaining_structured_data,
+                    structured_data_workers,
+                ),
+                (
+                    process_individual_filing_batch,
+                    individual_filing_batches,
+                    individual_filing_workers,
+                ),
+            ]:
+                if not tasks:
+                    continue
+                pool = multiprocessing.Pool(processes=workers)
+                pools.append(pool)
+                results = pool.imap_unordered(
+                    process_task,
+                    tasks,
+                    chunksize=max(1, len(tasks) // (workers * 4)),
                 )
-
-                # Start processes for individual filings
-                individual_filing_results = pool.starmap_async(
-                    process_individual_filing,
-                    [(file, progress_queue) for file in remaining_individual_filings],
-                    chunksize=1,
+                # Daemon threads cannot keep the interpreter alive while they
+                # wait on a pool that an interrupted main thread terminated
+                progress_threads.append(
+                    threading.Thread(
+                        target=record_progress,
+                        args=(
+                            results,
+                            progress_tracker,
+                            progress,
+                            progress_tasks,
+                            lock,
+                        ),
+                        daemon=True,
+                    )
                 )
 
-                total_tasks = len(remaining_structured_data) + len(
-                    remaining_individual_filings
-                )
-                completed_tasks = 0
-
-                while completed_tasks < total_tasks:
-                    try:
-                        message = progress_queue.get(timeout=1)
-                        category, file_path, year, quarter, item = message
-                        if category == "structured_data":
-                            progress_tracker.mark_processed(
-                                category, year, quarter, item
-                            )
-                            progress.update(structured_data_task, advance=1)
-                        elif category == "individual_filings":
-                            progress_tracker.mark_processed(
-                                category, year, quarter, item
-                            )
-                            progress.update(individual_filings_task, advance=1)
-                        completed_tasks += 1
-                    except Empty:
-                        if (
-                            structured_data_results.ready()
-                            and individual_filing_results.ready()
-                        ):
-                            break
-                        continue
-
-                # Ensure all tasks are completed
-                structured_data_results.get()
-                individual_filing_results.get()
+            for progress_thread in progress_threads:
+                progress_thread.start()
+
+            # Ensure all tasks are completed
+            for progress_thread in progress_threads:
+                progress_thread.join()
+
+            # Let the workers exit normally so their connections are closed
+            for pool in pools:
+                pool.close()
+                pool.join()
+        finally:
+            for pool in pools:
+                pool.terminate()
 
     progress_tracker.save_progress()
 
@@ -745,16 +1212,15 @@ def post_process_data():
         logging.info("Removing filings before 2014...")
         cur.execute(
             """
-            DELETE FROM holdings
-            WHERE filing_id IN (
-                SELECT id FROM filings
+            WITH deleted_filings AS (
+                DELETE FROM filings
                 WHERE EXTRACT(YEAR FROM periodofreport) < 2014
+                RETURNING id
             )
+            DELETE FROM holdings
+            WHERE filing_id IN (TABLE deleted_filings)
             """
         )
-        cur.execute(
-            "DELETE FROM filings WHERE EXTRACT(YEAR FROM periodofreport) < 2014"
-        )
         conn.commit()
         logging.info("Filings before 2014 removed.")
 
@@ -762,16 +1228,15 @@ def post_process_data():
         logging.info("Removing 13F-NT and 13F-NT/A filings...")
         cur.execute(
             """
-            DELETE FROM holdings
-            WHERE filing_id IN (
-                SELECT id FROM filings
+            WITH deleted_filings AS (
+                DELETE FROM filings
                 WHERE submissiontype IN ('13F-NT', '13F-NT/A')
+                RETURNING id
             )
+            DELETE FROM holdings
+            WHERE filing_id IN (TABLE deleted_filings)
             """
         )
-        cur.execute(
-            "DELETE FROM filings WHERE submissiontype IN ('13F-NT', '13F-NT/A')"
-        )
         conn.commit()
         logging.info("13F-NT and 13F-NT/A filings removed.")
 
@@ -786,13 +1251,13 @@ def post_process_data():
         )
         cur.execute(
             """
-            DELETE FROM holdings
-            WHERE filing_id IN (
-                SELECT id FROM filings
+            WITH deleted_filings AS (
+                DELETE FROM filings
                 WHERE cik = '0001780067' AND periodofreport = '2020-12-31'
-            );
-            DELETE FROM filings
-            WHERE cik = '0001780067' AND periodofreport = '2020-12-31'
+                RETURNING id
+            )
+            DELETE FROM holdings
+            WHERE filing_id IN (TABLE deleted_filings)
             """
         )
         conn.commit()
@@ -805,49 +1270,33 @@ def post_process_data():
 
             UPDATE filings SET restated_by = NULL;
 
-            WITH latest_filings AS (
-                SELECT 
-                    cik, 
-                    periodofreport,
-                    MAX(CASE WHEN amendmenttype = 'RESTATEMENT' THEN filing_date ELSE '1900-01-01'::DATE END) AS latest_restatement_date,
-                    MAX(filing_date) AS latest_filing_date
+            WITH ranked_filings AS (
+                SELECT
+                    id,
+                    filing_date,
+                    amendmenttype,
+                    FIRST_VALUE(id) OVER latest AS latest_filing_id,
+                    FIRST_VALUE(filing_date) OVER latest AS latest_filing_date,
+                    FIRST_VALUE(amendmenttype) OVER latest AS latest_amendmenttype
                 FROM filings
                 WHERE amendmenttype IS NULL OR amendmenttype = 'RESTATEMENT'
-                GROUP BY cik, periodofreport
+                WINDOW latest AS (
+                    PARTITION BY cik, periodofreport
+                    ORDER BY
+                        filing_date DESC,
+                        CASE WHEN amendmenttype = 'RESTATEMENT' THEN 0 ELSE 1 END,
+                        id
+                )
             )
             UPDATE filings f
-            SET restated_by = lf.latest_filing_id
-            FROM (
-                SELECT 
-                    lf.cik,
-                    lf.periodofreport,
-                    lf.latest_restatement_date,
-                    lf.latest_filing_date,
-                    CASE
-                        WHEN lf.latest_restatement_date = lf.latest_filing_date THEN
-                            (SELECT id FROM filings f2
-                             WHERE f2.cik = lf.cik 
-                             AND f2.periodofreport = lf.periodofreport 
-                             AND f2.filing_date = lf.latest_filing_date
-                             AND f2.amendmenttype = 'RESTATEMENT'
-                             LIMIT 1)
-                        ELSE
-                            (SELECT id FROM filings f2
-                             WHERE f2.cik = lf.cik 
-                             AND f2.periodofreport = lf.periodofreport 
-                             AND f2.filing_date = lf.latest_filing_date
-                             LIMIT 1)
-                    END AS latest_filing_id
-                FROM latest_filings lf
-            ) lf
-            WHERE f.cik = lf.cik
-            AND f.periodofreport = lf.periodofreport
+            SET restated_by = rf.latest_filing_id
+            FROM ranked_filings rf
+            WHERE f.id = rf.id
+            AND f.id != rf.latest_filing_id
             AND (
-                (f.filing_date < lf.latest_filing_date)
-                OR (f.filing_date = lf.latest_filing_date AND f.amendmenttype IS NULL AND lf.latest_restatement_date = lf.latest_filing_date)
-            )
-            AND (f.amendmenttype IS NULL OR f.amendmenttype = 'RESTATEMENT')
-            AND f.id != lf.latest_filing_id;
+                (rf.filing_date < rf.latest_filing_date)
+                OR (rf.amendmenttype IS NULL AND rf.latest_amendmenttype = 'RESTATEMENT')
+            );
         """)
         conn.commit()
         logging.info("Handled amendments.")
@@ -862,6 +1311,163 @@ def post_process_data():
     logging.info("Post-processing completed.")
 
 
+# Value of each ASCII character in a CUSIP check digit computation, -1 if the
+# character is not allowed
+CUSIP_CHAR_VALUES = np.full(256, -1, dtype=np.int16)
+CUSIP_CHAR_VALUES[np.frombuffer(string.digits.encode(), dtype=np.uint8)] = range(10)
+CUSIP_CHAR_VALUES[np.frombuffer(string.ascii_uppercase.encode(), dtype=np.uint8)] = (
+    range(10, 36)
+)
+
+# Weight of each of the 8 base characters of a CUSIP
+CUSIP_WEIGHTS = np.array([1, 2, 1, 2, 1, 2, 1, 2], dtype=np.int16)
+
+# Sum of the decimal digits of each weighted character value (at most 35 * 2)
+CUSIP_DIGIT_SUMS = np.array([sum(divmod(v, 10)) for v in range(100)], dtype=np.int16)
+
+# Characters tried when padding a 7-character CUSIP, in order of preference
+CUSIP_PAD_CHARS = string.ascii_uppercase + string.digits
+
+
+def cusip_check_digits(bases: pl.Series) -> pl.Series:
+    """
+    Compute the check digits of CUSIP bases in a single vectorized pass.
+
+    Args:
+        bases (pl.Series): 8-character CUSIP bases.
+
+    Returns:
+        pl.Series: The check digit of each base, or null if the base is not made
+            of 8 digits or uppercase letters.
+    """
+    is_ascii_mask = (bases.str.len_bytes() == 8).fill_null(False)
+    is_ascii = is_ascii_mask.to_numpy()
+    codes = np.zeros((len(bases), 8), dtype=np.uint8)
+    # Concatenate the bases in Polars so no Python string is created per base
+    codes[is_ascii] = np.frombuffer(
+        bases.filter(is_ascii_mask).str.join("").item().encode(), dtype=np.uint8
+    ).reshape(-1, 8)
+
+    values = CUSIP_CHAR_VALUES[codes]
+    is_valid = is_ascii & (values >= 0).all(axis=1)
+    digit_sums = CUSIP_DIGIT_SUMS[np.maximum(values, 0) * CUSIP_WEIGHTS]
+    check_digits = (10 - digit_sums.sum(axis=1) % 10) % 10
+
+    return (
+        pl.Series(np.where(is_valid, check_digits, np.nan), nan_to_null=True)
+        .cast(pl.Int8)
+        .cast(pl.String)
+    )
+
+
+def first_known_cusips(candidates: pl.LazyFrame, ftd_cusips: pl.Series) -> pl.LazyFrame:
+    """
+    Keep the candidate fix of each CUSIP with the lowest priority that is a
+    known CUSIP.
+
+    Args:
+        candidates (pl.LazyFrame): The cusip, fixed_cusip and priority of each candidate.
+        ftd_cusips (pl.Series): The known CUSIPs from the FTD data.
+
+    Returns:
+        pl.LazyFrame: The cusip and fixed_cusip of each CUSIP with a known candidate.
+    """
+    return (
+        candidates.join(
+            ftd_cusips.to_frame("fixed_cusip").lazy(), on="fixed_cusip", how="semi"
+        )
+        .group_by("cusip")
+        .agg(pl.col("fixed_cusip").sort_by("priority").first())
+    )
+
+
+def find_checksum_fixes(cusips: pl.LazyFrame, ftd_cusips: pl.Series) -> pl.LazyFrame:
+    """
+    Complete short CUSIPs with a check digit, keeping the completions found in
+    the FTD data.
+
+    8-character CUSIPs get their check digit appended. 7-character CUSIPs are
+    padded on the left with each of CUSIP_PAD_CHARS in turn, then on the right
+    with the last of them, and the first completion that is a known CUSIP is
+    used.
+
+    Args:
+        cusips (pl.LazyFrame): The short CUSIPs to fix, in a cusip column.
+        ftd_cusips (pl.Series): The known CUSIPs from the FTD data.
+
+    Returns:
+        pl.LazyFrame: The cusip and fixed_cusip of each CUSIP that could be fixed.
+    """
+    pads_df = (
+        pl.DataFrame(
+            {
+                "pad": list(CUSIP_PAD_CHARS) + [CUSIP_PAD_CHARS[-1]],
+                "pad_left": [True] * len(CUSIP_PAD_CHARS) + [False],
+            }
+        )
+        .with_row_index("priority")
+        .lazy()
+    )
+
+    # One candidate base per 8-character CUSIP, one per padding otherwise
+    candidates_df = pl.concat(
+        [
+            cusips.filter(pl.col("cusip").str.len_chars() == 8).select(
+                "cusip",
+                pl.col("cusip").alias("base"),
+                pl.lit(0, pl.UInt32).alias("priority"),
+            ),
+            cusips.filter(pl.col("cusip").str.len_chars() == 7)
+            .join(pads_df, how="cross")
+            .select(
+                "cusip",
+                pl.when("pad_left")
+                .then(pl.concat_str("pad", "cusip"))
+                .otherwise(pl.concat_str("cusip", "pad"))
+                .alias("base"),
+                "priority",
+            ),
+        ]
+    )
+
+    return first_known_cusips(
+        candidates_df.with_columns(
+            pl.concat_str(
+                "base",
+                pl.col("base").map_batches(
+                    cusip_check_digits, return_dtype=pl.String, is_elementwise=True
+                ),
+            ).alias("fixed_cusip")
+        ),
+        ftd_cusips,
+    )
+
+
+def read_cusips_csv(buffer: BytesIO) -> pl.LazyFrame:
+    """
+    Read CUSIPs copied out of the database as CSV, normalized and deduplicated.
+
+    Args:
+        buffer (BytesIO): The output of a COPY ... TO STDOUT WITH (FORMAT csv)
+            of a single CUSIP column, which may be empty.
+
+    Returns:
+        pl.LazyFrame: The distinct normalized CUSIPs, in a cusip column.
+    """
+    # Normalizing can map several stored CUSIPs to the same value
+    return (
+        pl.read_csv(
+            buffer,
+            has_header=False,
+            schema={"cusip": pl.String},
+            raise_if_empty=False,
+        )
+        .lazy()
+        .with_columns(pl.all().str.strip_chars().str.to_uppercase())
+        .unique()
+    )
+
+
 def clean_cusips():
     """
     Cleans and fixes CUSIPs in the holdings table.
@@ -878,20 +1484,22 @@ def clean_cusips():
         conn = psycopg2.connect(dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
         cur = conn.cursor()
 
-        # Load FTD CUSIPs
-        ftd_cusips = set(
-            pl.read_csv(os.path.join(FTD_DIR, "ftd_data.csv"), infer_schema=False)
+        # Load FTD CUSIPs once as a Series shared by every known CUSIP lookup
+        ftd_cusips = (
+            pl.scan_csv(os.path.join(FTD_DIR, "ftd_data.csv"), infer_schema=False)
             .select(pl.col("cusip").str.strip_chars().str.to_uppercase())
             .drop_nulls()
+            .unique()
+            .collect()
             .to_series()
         )
         logging.info(f"Loaded {len(ftd_cusips)} unique CUSIPs from FTD data")
 
         # Create temporary table for FTD CUSIPs
         cur.execute("CREATE TEMPORARY TABLE ftd_cusips (cusip TEXT PRIMARY KEY)")
-        cur.executemany(
-            "INSERT INTO ftd_cusips (cusip) VALUES (%s)",
-            [(cusip,) for cusip in ftd_cusips],
+        cur.copy_expert(
+            "COPY ftd_cusips FROM STDIN",
+            StringIO("".join(f"{copy_value(cusip)}\n" for cusip in ftd_cusips)),
         )
 
         # 1. Swap CUSIPs in titleofclass
@@ -903,6 +1511,7 @@ def clean_cusips():
                 LEFT JOIN ftd_cusips f ON h.cusip = f.cusip
                 JOIN ftd_cusips f2 ON h.titleofclass = f2.cusip
                 WHERE f.cusip IS NULL
+                  AND LENGTH(h.titleofclass) = 9
             )
             UPDATE holdings h
             SET 
@@ -926,6 +1535,7 @@ def clean_cusips():
                 LEFT JOIN ftd_cusips f ON h.cusip = f.cusip
                 JOIN ftd_cusips f2 ON h.nameofissuer = f2.cusip
                 WHERE f.cusip IS NULL
+                  AND LENGTH(h.nameofissuer) = 9
             )
             UPDATE holdings h
             SET 
@@ -943,108 +1553,83 @@ def clean_cusips():
         # 3. Handle short CUSIPs
         logging.info("Handling short CUSIPs...")
 
-        # Helper functions (same as in your original function)
-        def compute_check_digit(cusip):
-            if len(cusip) != 8 or not cusip.isalnum():
-                return None
-            values = [
-                int(c) if c.isdigit() else (ord(c) - ord("A") + 10) for c in cusip
-            ]
-            total = sum(
-                (value * 2 if i % 2 else value) for i, value in enumerate(values)
-            )
-            check_digit = (10 - (total % 10)) % 10
-            return str(check_digit)
-
-        def find_valid_cusips(cusip, ftd_cusips):
-            if len(cusip) == 8:
-                full_cusip = cusip + compute_check_digit(cusip)
-                return full_cusip if full_cusip in ftd_cusips else None
-            elif len(cusip) == 7:
-                for char in string.ascii_uppercase + string.digits:
-                    left_padded = char + cusip
-                    check_digit = compute_check_digit(left_padded)
-                    if check_digit:
-                        full_cusip = left_padded + check_digit
-                        if full_cusip in ftd_cusips:
-                            return full_cusip
-                right_padded = cusip + char
-                check_digit = compute_check_digit(right_padded)
-                if check_digit:
-                    full_cusip = right_padded + check_digit
-                    if full_cusip in ftd_cusips:
-                        return full_cusip
-            return None
-
-        query = """
-            SELECT DISTINCT cusip
-            FROM holdings
-            WHERE LENGTH(cusip) < 9
-        """
-        df_cusips = pl.read_database(query, connection=conn)
-        df_cusips = df_cusips.with_columns(
-            pl.all().str.strip_chars().str.to_uppercase()
-        )
-
-        # 3a. Check left padding
-        left_padded = df_cusips.with_columns(
-            pl.col("cusip").str.zfill(9).alias("fixed_cusip")
-        )
-        left_matched = left_padded.filter(pl.col("fixed_cusip").is_in(ftd_cusips))
-        df_cusips_remaining = left_padded.filter(
-            ~pl.col("fixed_cusip").is_in(ftd_cusips)
-        ).drop("fixed_cusip")
-
-        # 3b. Check right padding
-        right_padded = df_cusips_remaining.with_columns(
-            pl.col("cusip").str.pad_end(9, "0").alias("fixed_cusip")
-        )
-        right_matched = right_padded.filter(pl.col("fixed_cusip").is_in(ftd_cusips))
-        df_cusips_remaining = right_padded.filter(
-            ~pl.col("fixed_cusip").is_in(ftd_cusips)
-        ).drop("fixed_cusip")
-
-        # 3c. Apply checksum fix
-        df_cusips_remaining = df_cusips_remaining.with_columns(
-            pl.col("cusip")
-            .map_elements(
-                lambda x: find_valid_cusips(x, ftd_cusips), return_dtype=pl.String
-            )
-            .alias("fixed_cusip")
-        )
-        checksum_matched = df_cusips_remaining.filter(
-            pl.col("fixed_cusip").is_not_null()
+        # Stream the short CUSIPs as CSV straight into Polars
+        buffer = BytesIO()
+        cur.copy_expert(
+            """
+            COPY (
+                SELECT DISTINCT cusip
+                FROM holdings
+                WHERE LENGTH(cusip) < 9
+            ) TO STDOUT WITH (FORMAT csv)
+            """,
+            buffer,
         )
-        df_cusips_remaining = df_cusips_remaining.filter(
-            pl.col("fixed_cusip").is_null()
-        ).drop("fixed_cusip")
-
-        # 3d. lpad remaining to 9 chars
-        df_cusips_remaining = df_cusips_remaining.with_columns(
-            pl.col("cusip").str.zfill(9).alias("fixed_cusip")
+        buffer.seek(0)
+        # Build all the fixes as one lazy plan, collected once below
+        df_cusips = read_cusips_csv(buffer)
+
+        # 3a. Check left and right padding in a single pass
+        left_padded = pl.col("cusip").str.zfill(9)
+        right_padded = pl.col("cusip").str.pad_end(9, "0")
+        padded_matched = first_known_cusips(
+            pl.concat(
+                [
+                    df_cusips.select(
+                        "cusip",
+                        left_padded.alias("fixed_cusip"),
+                        pl.lit(0, pl.UInt32).alias("priority"),
+                    ),
+                    df_cusips.select(
+                        "cusip",
+                        right_padded.alias("fixed_cusip"),
+                        pl.lit(1, pl.UInt32).alias("priority"),
+                    ),
+                ]
+            ),
+            ftd_cusips,
+        ).rename({"fixed_cusip": "padded_cusip"})
+        df_cusips = df_cusips.join(padded_matched, on="cusip", how="left")
+
+        # 3b. Apply checksum fix to the CUSIPs padding did not fix
+        checksum_matched = find_checksum_fixes(
+            df_cusips.filter(pl.col("padded_cusip").is_null()).select("cusip"),
+            ftd_cusips,
         )
 
-        all_fixes = pl.concat(
-            [left_matched, right_matched, checksum_matched, df_cusips_remaining]
-        )
-        cusip_fixes = dict(zip(all_fixes["cusip"], all_fixes["fixed_cusip"]))
-
-        # Fix / lpad short CUSIPs
-        update_query = """
-            UPDATE holdings
-            SET cusip = CASE cusip 
-                {}
-                ELSE cusip 
-            END
-            WHERE cusip IN %s
-            RETURNING id
-        """.format(
-            "\n                ".join(
-                f"WHEN '{old}' THEN '{new}'" for old, new in cusip_fixes.items()
+        # 3c. Take the first fix found, and lpad remaining to 9 chars
+        all_fixes = (
+            df_cusips.join(checksum_matched, on="cusip", how="left")
+            .select(
+                "cusip",
+                pl.coalesce("padded_cusip", "fixed_cusip", left_padded).alias(
+                    "fixed_cusip"
+                ),
             )
+            .collect()
         )
 
-        cur.execute(update_query, (tuple(cusip_fixes.keys()),))
+        # Fix / lpad short CUSIPs through a join against the fixes
+        cur.execute(
+            """
+            CREATE TEMPORARY TABLE cusip_fixes (
+                cusip TEXT PRIMARY KEY,
+                fixed_cusip TEXT NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+        buffer = BytesIO()
+        all_fixes.write_csv(buffer, include_header=False)
+        buffer.seek(0)
+        cur.copy_expert("COPY cusip_fixes FROM STDIN WITH (FORMAT csv)", buffer)
+        cur.execute("ANALYZE cusip_fixes")
+        cur.execute("""
+            UPDATE holdings h
+            SET cusip = cf.fixed_cusip
+            FROM cusip_fixes cf
+            WHERE h.cusip = cf.cusip
+            RETURNING h.id
+        """)
 
         updated_rows = cur.fetchall()
         conn.commit()
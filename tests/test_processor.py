@@ -0,0 +1,106 @@
+import atexit
+import os
+import random
+import string
+import tempfile
+import unittest
+from io import BytesIO
+from typing import Optional
+
+import polars as pl
+
+import orjson
+
+from processor import ProgressTracker, cusip_check_digits, read_cusips_csv
+
+
+def reference_check_digit(base: str) -> Optional[str]:
+    """
+    Compute the check digit of a CUSIP base one character at a time.
+
+    Args:
+        base (str): An 8-character CUSIP base.
+
+    Returns:
+        Optional[str]: The check digit, or None if the base is not made of 8
+            digits or uppercase letters.
+    """
+    if len(base) != 8 or any(
+        c not in string.ascii_uppercase + string.digits for c in base
+    ):
+        return None
+    values = [int(c) if c.isdigit() else ord(c) - ord("A") + 10 for c in base]
+    total = sum(
+        sum(divmod(value * 2 if i % 2 else value, 10)) for i, value in enumerate(values)
+    )
+    return str((10 - total % 10) % 10)
+
+
+class CusipCheckDigitsTest(unittest.TestCase):
+    def test_known_cusips(self):
+        cusips = ["037833100", "594918104", "38259P508", "88160R101"]
+        check_digits = cusip_check_digits(pl.Series([c[:8] for c in cusips]))
+        self.assertEqual(check_digits.to_list(), [c[8] for c in cusips])
+
+    def test_matches_reference(self):
+        random.seed(0)
+        chars = string.ascii_uppercase + string.digits
+        bases = ["".join(random.choices(chars, k=8)) for _ in range(500)]
+        bases += ["0378331", "037833100", "0378331a", "ÄBCDEFG", "ÄBCDEFGH", "", None]
+        check_digits = cusip_check_digits(pl.Series(bases, dtype=pl.String))
+        self.assertEqual(
+            check_digits.to_list(),
+            [None if b is None else reference_check_digit(b) for b in bases],
+        )
+
+    def test_no_valid_bases(self):
+        self.assertEqual(
+            cusip_check_digits(pl.Series(["abc", None])).to_list(), [None, None]
+        )
+        self.assertEqual(
+            cusip_check_digits(pl.Series([], dtype=pl.String)).to_list(), []
+        )
+
+
+class ReadCusipsCsvTest(unittest.TestCase):
+    def test_normalizes_and_deduplicates(self):
+        df = read_cusips_csv(BytesIO(b'abc\n ABC \n0378331\n"A,B"\n')).collect()
+        self.assertEqual(sorted(df["cusip"].to_list()), ["0378331", "A,B", "ABC"])
+
+    def test_empty_copy(self):
+        df = read_cusips_csv(BytesIO()).collect()
+        self.assertEqual(df.schema, {"cusip": pl.String})
+        self.assertEqual(len(df), 0)
+
+
+class ProgressTrackerTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, "processing_progress.json")
+        self.log_filename = os.path.join(directory.name, "processing_progress.log")
+
+    def test_flush_log(self):
+        tracker = ProgressTracker(self.filename)
+        self.addCleanup(atexit.unregister, tracker.save_progress)
+        tracker.mark_processed("structured_data", 2023, 4, "2023_Q4")
+        tracker.flush_log()
+        with open(self.log_filename) as f:
+            self.assertEqual(f.read(), "processed\tstructured_data\t2023\t4\t2023_Q4\n")
+
+    def test_replay_log_saves_progress(self):
+        with open(self.log_filename, "w") as f:
+            f.write("processed\tstructured_data\t2023\t4\t2023_Q4\n")
+            f.write("failed\tindividual_filings\t2024\tQ1\t0001.txt\n")
+
+        tracker = ProgressTracker(self.filename)
+        self.assertTrue(tracker.is_processed("structured_data", 2023, 4, "2023_Q4"))
+        self.assertEqual(os.path.getsize(self.log_filename), 0)
+        with open(self.filename, "rb") as f:
+            data = orjson.loads(f.read())
+        self.assertEqual(data["structured_data"]["processed"], ["2023_Q4"])
+        self.assertEqual(data["individual_filings"]["2024_Q1"]["failed"], ["0001.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()